@@ -4,9 +4,16 @@ import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
-from ta.momentum import RSIIndicator
+from tsdownsample import MinMaxLTTBDownsampler
 import wikipedia
+import requests_cache
+from requests.adapters import HTTPAdapter
+import math
+import queue
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -18,8 +25,48 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+def _new_wikipedia_session():
+    """Create a cached, connection-pooled session for Wikipedia API calls"""
+    # Wikipedia summaries rarely change, so responses are kept on disk for a day
+    session = requests_cache.CachedSession("stock_app_cache", expire_after=86400)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+class _WikipediaRequests:
+    """Stand-in for the requests module used inside the wikipedia package"""
+    
+    def __init__(self):
+        self._sessions = queue.Queue()
+    
+    def get(self, *args, **kwargs):
+        # requests sessions are not thread-safe, so each call checks one out of a
+        # long-lived pool and returns it afterwards; the pool only grows to the
+        # number of concurrent lookups
+        try:
+            session = self._sessions.get_nowait()
+        except queue.Empty:
+            session = _new_wikipedia_session()
+        try:
+            return session.get(*args, **kwargs)
+        finally:
+            self._sessions.put(session)
+
+@st.cache_resource
+def install_shared_session():
+    """Route Wikipedia lookups through a process-wide pool of cached sessions"""
+    # Workaround: the wikipedia package calls requests.get() for every lookup and has
+    # no session hook, so a fresh connection is opened each time. Its only use of the
+    # requests module is requests.get, so we swap in an object with the same method.
+    # yfinance already shares a single session across all Ticker objects.
+    wikipedia.wikipedia.requests = _WikipediaRequests()
+    return wikipedia.wikipedia.requests
+
+install_shared_session()
+
 # Custom CSS for better styling
-st.markdown("""
+_CSS_BLOB = """
 <style>
     .main-header {
         font-size: 3.5rem;
@@ -69,129 +116,395 @@ st.markdown("""
         margin: 0 0.5rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Page header banner
+_HEADER_HTML = """
+<div class="header-container">
+    <div style="text-align: center;">
+        <div style="font-size: 5rem; margin-bottom: 1rem; background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #96ceb4, #feca57); background-size: 300% 300%; animation: gradient 3s ease infinite;">
+            📊📈💹🚀💰
+        </div>
+        <h1 class="main-header">Stock Analysis Dashboard</h1>
+        <div style="font-size: 1.3rem; color: #555; margin-top: 1.5rem; font-weight: 500;">
+            <span class="feature-icons">🎯</span>Simple stock analysis with price trends and comprehensive metrics<span class="feature-icons">📊</span>
+        </div>
+        <div style="margin-top: 1.5rem; font-size: 1rem; color: #777; display: flex; justify-content: center; flex-wrap: wrap; gap: 2rem;">
+            <span><strong>✨ Real-time Data</strong></span>
+            <span><strong>📚 Educational Explanations</strong></span>
+            <span><strong>💾 CSV Exports</strong></span>
+            <span><strong>📈 Up to 10 Stocks</strong></span>
+        </div>
+    </div>
+</div>
+
+<style>
+@keyframes gradient {
+    0% { background-position: 0% 50%; }
+    50% { background-position: 100% 50%; }
+    100% { background-position: 0% 50%; }
+}
+</style>
+"""
+
+# Sections of the "Complete Guide to All Stock Metrics" expander
+_GUIDE_VALUATION_MD = """
+### 💰 Valuation Metrics - "Is this stock expensive or cheap?"
+
+**💵 Price:**
+- **What it is:** Current cost to buy one share
+- **How to use:** Compare with historical prices
+- **Example:** Apple at $150 = you pay $150 for one share
+
+**📊 P/E Ratio (Price-to-Earnings):**
+- **What it is:** How much you pay for each dollar of profit
+- **Formula:** Stock Price ÷ Annual Earnings per Share
+- **Low P/E (5-15):** Cheap stock or troubled company
+- **Medium P/E (15-25):** Fairly valued
+- **High P/E (25+):** Expensive, high growth expected
+- **Example:** P/E of 20 = pay $20 for every $1 of annual profit
+
+**🔮 Forward P/E:**
+- **What it is:** P/E based on expected future earnings
+- **Why important:** Shows future value expectations
+- **Lower than current P/E:** Growing earnings expected
+
+**📖 Price/Book:**
+- **What it is:** Price vs company's asset value
+- **Below 1:** Trading below asset value (potential bargain)
+- **1-3:** Normal range
+- **Above 3:** Premium valuation
+"""
+
+_GUIDE_TECHNICAL_MD = """
+### 📈 Technical Indicators - "What's the momentum?"
+
+**🎯 RSI (0-100 scale):**
+- **What it is:** Momentum meter for stocks
+- **0-30:** Oversold (might bounce up)
+- **30-70:** Normal range
+- **70-100:** Overbought (might drop)
+- **Example:** RSI 80 = rising very fast lately
+
+**📊 50-day Moving Average:**
+- **What it is:** Average price over 50 days
+- **Purpose:** Shows real trend, ignores daily noise
+- **Price above MA:** Upward trend
+- **Price below MA:** Downward trend
+
+**⚡ Beta:**
+- **What it is:** Volatility vs market
+- **Beta < 1:** Less volatile (safer)
+- **Beta = 1:** Moves with market
+- **Beta > 1:** More volatile (riskier)
+- **Example:** Beta 1.5 = if market +10%, stock typically +15%
+"""
+
+_GUIDE_HEALTH_MD = """
+### 🏢 Company Health - "How strong is the company?"
+
+**🏦 Market Cap:**
+- **What it is:** Total company value
+- **Small Cap:** Under $2B (risky, high potential)
+- **Mid Cap:** $2-10B (balanced)
+- **Large Cap:** Over $10B (stable)
+
+**💳 Debt/Equity:**
+- **What it is:** How much debt vs equity
+- **Low (0-0.3):** Conservative, safe
+- **Medium (0.3-0.6):** Balanced
+- **High (0.6+):** Aggressive, risky
+"""
+
+_GUIDE_ANALYST_MD = """
+### 🎯 Analyst Data - "What do experts think?"
+
+**⭐ Analyst Rating:**
+- **Strong Buy:** Very bullish
+- **Buy:** Positive outlook
+- **Hold:** Neutral
+- **Sell:** Negative outlook
+
+**🎯 Target Price:**
+- **What it is:** Expected price in 12 months
+- **Target > Current:** Expected to rise
+- **Target < Current:** Expected to fall
+- **Note:** Predictions, not guarantees!
+"""
+
+st.markdown(_CSS_BLOB, unsafe_allow_html=True)
+
+# Columns of the key metrics table, in display order
+METRIC_KEYS = [
+    "Ticker", "Price", "P/E", "Forward P/E", "Price/Book", "Market Cap",
+    "Debt/Equity", "RSI", "50-day MA", "Beta", "Analyst Rating", "Target Price"
+]
+
+# Market cap suffixes indexed by thousands-exponent above one million
+MARKET_CAP_SUFFIXES = [("M", 1e6), ("B", 1e9), ("T", 1e12)]
 
 def format_market_cap(value):
     """Format market cap with M/B/T suffixes"""
-    if value is None or value == 0:
+    if value is None or pd.isna(value) or not math.isfinite(value) or value == 0:
         return "N/A"
     
-    if value >= 1_000_000_000_000:  # Trillions
-        return f"${value / 1_000_000_000_000:.2f}T"
-    elif value >= 1_000_000_000:  # Billions
-        return f"${value / 1_000_000_000:.2f}B"
-    elif value >= 1_000_000:  # Millions
-        return f"${value / 1_000_000:.2f}M"
-    else:
+    if value < 1_000_000:
         return f"${value:,.0f}"
+    
+    suffix, scale = MARKET_CAP_SUFFIXES[min(2, int(math.log10(value)) // 3 - 2)]
+    return f"${value / scale:.2f}{suffix}"
+
+def fast_sma(a, n):
+    """Calculate a simple moving average using a cumulative sum"""
+    a = np.asarray(a, dtype=float)
+    out = np.full(a.shape, np.nan)
+    if len(a) < n:
+        return out
+    
+    c = np.cumsum(np.insert(a, 0, 0.0))
+    out[n - 1:] = (c[n:] - c[:-n]) / n
+    return out
+
+def fast_sma_last(a, n):
+    """Get only the latest simple moving average value"""
+    if len(a) < n:
+        return None
+    return float(np.mean(a[-n:]))
+
+def fast_rsi(close, n=14):
+    """Calculate RSI in a single pass using Wilder's smoothing"""
+    close = np.asarray(close, dtype=float)
+    rsi = np.full(close.shape, np.nan)
+    if len(close) <= n:
+        return rsi
+    
+    diff = np.diff(close)
+    gain = np.maximum(diff, 0)
+    loss = -np.minimum(diff, 0)
+    
+    # Seed with the simple average of the first n moves, then apply Wilder's recursion
+    avg_gain = np.full(diff.shape, np.nan)
+    avg_loss = np.full(diff.shape, np.nan)
+    g, l = gain[:n].mean(), loss[:n].mean()
+    avg_gain[n - 1], avg_loss[n - 1] = g, l
+    for i, (up, down) in enumerate(zip(gain[n:].tolist(), loss[n:].tolist()), start=n):
+        g = (g * (n - 1) + up) / n
+        l = (l * (n - 1) + down) / n
+        avg_gain[i], avg_loss[i] = g, l
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi[1:] = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + avg_gain / avg_loss))
+    return rsi
+
+# How far back each selectable period reaches from the latest bar
+PERIOD_OFFSETS = {
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5)
+}
+
+def _download_histories(tickers, period):
+    """Download price history for all tickers in a single request"""
+    # Match Ticker.history(): adjusted prices plus Dividends/Stock Splits columns,
+    # whatever the installed yfinance version's download defaults are
+    df = yf.download(" ".join(tickers), period=period, group_by="ticker",
+                     auto_adjust=True, actions=True, threads=True, progress=False)
+    
+    histories = {}
+    for ticker in tickers:
+        # Older yfinance versions return flat columns for a single ticker
+        if isinstance(df.columns, pd.MultiIndex):
+            if ticker not in df.columns.get_level_values(0):
+                continue
+            hist = df[ticker]
+        else:
+            hist = df
+        histories[ticker] = hist.dropna(how="all")
+    
+    return histories
+
+# cache_resource hands back the same frames without unpickling them on every rerun,
+# so callers must treat them as read-only
+@st.cache_resource(ttl=86400, max_entries=10)  # Cache for 1 day
+def get_full_history_batch(tickers):
+    """Download the full price history for all tickers - past bars rarely change"""
+    return _download_histories(tickers, "max")
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def get_recent_history_batch(tickers):
+    """Download the last few days of price history for all tickers"""
+    return _download_histories(tickers, "5d")
+
+def _adjustment_changed(full_hist, recent_hist):
+    """Check whether a split or dividend re-adjusted prices since the full history was fetched"""
+    # The last cached bar may be an intraday snapshot, so only compare settled bars
+    overlap = full_hist.index[:-1].intersection(recent_hist.index)
+    if overlap.empty:
+        return False
+    return not np.allclose(full_hist.loc[overlap, "Close"], recent_hist.loc[overlap, "Close"],
+                           rtol=1e-4, equal_nan=True)
+
+def _merge_histories(tickers, full, recent):
+    """Join cached full histories with the fresh recent bars"""
+    histories = {}
+    for ticker in tickers:
+        full_hist, recent_hist = full.get(ticker), recent.get(ticker)
+        if full_hist is None or recent_hist is None or recent_hist.empty:
+            hist = full_hist if full_hist is not None else recent_hist
+        else:
+            hist = pd.concat([full_hist.loc[full_hist.index < recent_hist.index[0]], recent_hist])
+        if hist is not None:
+            histories[ticker] = hist
+    return histories
+
+def get_history_batch(tickers):
+    """Get the full price history for all tickers, with the latest bars kept fresh"""
+    # Periods are sliced locally, so switching period never refetches
+    full = get_full_history_batch(tickers)
+    recent = get_recent_history_batch(tickers)
+    
+    # Prices are split/dividend adjusted, so a new corporate action rescales every older
+    # bar - refetch the full history rather than joining two different scales
+    if any(ticker in full and ticker in recent and _adjustment_changed(full[ticker], recent[ticker])
+           for ticker in tickers):
+        get_full_history_batch.clear(tickers)
+        full = get_full_history_batch(tickers)
+    
+    return _merge_histories(tickers, full, recent)
+
+def slice_history(hist, period):
+    """Get the part of a full history covered by the selected period"""
+    if hist is None or hist.empty:
+        return hist
+    return hist.loc[hist.index[-1] - PERIOD_OFFSETS[period]:]
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes
+def get_info(ticker):
+    """Get company info from Yahoo Finance"""
+    return yf.Ticker(ticker).info
 
 @st.cache_data(ttl=300)  # Cache for 5 minutes
-def get_stock_data(ticker, period="6mo"):
+def get_fast_info(ticker):
+    """Get last price and market cap from the lightweight fast_info accessor"""
+    fast_info = yf.Ticker(ticker).fast_info
+    return {
+        "last_price": fast_info.get("last_price"),
+        "market_cap": fast_info.get("market_cap")
+    }
+
+def get_stock_data(ticker, hist):
     """Get stock data matching the original script format"""
-    try:
-        tkr = yf.Ticker(ticker)
-        info = tkr.info
-        hist = tkr.history(period=period)
-        
-        if hist.empty:
-            return None
-            
-        # Calculate 50-day moving average
-        hist["MA50"] = hist["Close"].rolling(50).mean()
-        
-        # Calculate RSI
-        rsi = RSIIndicator(hist["Close"], 14).rsi()
-        
-        # Return data in the exact format from original script
-        return {
-            "Ticker": ticker.upper(),
-            "Price": info.get("currentPrice"),
-            "P/E": info.get("trailingPE"),
-            "Forward P/E": info.get("forwardPE"),
-            "Price/Book": info.get("priceToBook"),
-            "Market Cap": format_market_cap(info.get('marketCap', 0)),
-            "Debt/Equity": info.get("debtToEquity"),
-            "RSI": rsi.iloc[-1] if not rsi.isna().all() else None,
-            "50-day MA": hist["MA50"].iloc[-1] if not hist["MA50"].isna().all() else None,
-            "Beta": info.get("beta"),
-            "Analyst Rating": info.get("recommendationKey"),
-            "Target Price": info.get("targetMeanPrice"),
-            "history": hist,
-            "info": info
-        }
-    except Exception as e:
-        st.error(f"Error fetching data for {ticker}: {str(e)}")
+    # Runs in worker threads, so errors are raised for build_dashboard to report
+    if hist is None or hist.empty:
         return None
+    
+    # Valuation, analyst and company fields only exist in the full info payload
+    info = get_info(ticker)
+    price = info.get("currentPrice")
+    market_cap = info.get("marketCap")
+    
+    # Funds and indices often lack these in info - fall back to fast_info
+    if price is None or not market_cap:
+        try:
+            fast_info = get_fast_info(ticker)
+            price = price if price is not None else fast_info["last_price"]
+            market_cap = market_cap or fast_info["market_cap"]
+        except Exception:
+            pass
+    
+    # The full 50-day MA series is only built when a price chart is drawn
+    close = hist["Close"].to_numpy()
+    
+    # Calculate RSI
+    rsi = fast_rsi(close, 14)
+    
+    # Return data in the exact format from original script
+    return {
+        "Ticker": ticker.upper(),
+        "Price": price,
+        "P/E": info.get("trailingPE"),
+        "Forward P/E": info.get("forwardPE"),
+        "Price/Book": info.get("priceToBook"),
+        "Market Cap": format_market_cap(market_cap),
+        "Debt/Equity": info.get("debtToEquity"),
+        "RSI": rsi[-1] if not np.isnan(rsi[-1]) else None,
+        "50-day MA": fast_sma_last(close, 50),
+        "Beta": info.get("beta"),
+        "Analyst Rating": info.get("recommendationKey"),
+        "Target Price": info.get("targetMeanPrice"),
+        "history": hist,
+        "info": info
+    }
 
 @st.cache_data(ttl=600)  # Cache for 10 minutes
 def get_wikipedia_summary(ticker, sentences=3):
     """Get Wikipedia summary for the company with better search strategy"""
     try:
-        info = yf.Ticker(ticker).info
+        info = get_info(ticker)
         company_name = info.get("longName") or info.get("shortName")
     except Exception:
         company_name = None
 
-    # Better search strategy - prioritize company-specific terms
-    search_terms = []
-    if company_name:
-        # Add "Inc", "Corporation", "Company" to help disambiguate
-        search_terms.extend([
-            f"{company_name} Inc",
-            f"{company_name} Corporation",
-            f"{company_name} Company",
-            company_name
-        ])
-    
-    # Add ticker with "stock" or "company" to avoid confusion
-    search_terms.extend([
-        f"{ticker} stock",
-        f"{ticker} company",
-        f"{ticker} corporation",
-        ticker
-    ])
-
-    for term in search_terms:
+    # Keep Wikipedia's search ranking; fall back to the ticker if the company name finds nothing usable
+    queries = [company_name, f"{ticker} company"] if company_name else [f"{ticker} company"]
+    business_keywords = ['inc', 'corp', 'company', 'corporation', 'ltd', 'technology', 'software', 'systems']
+    
+    for query in queries:
         try:
-            return wikipedia.summary(term, sentences=sentences,
-                                   auto_suggest=True, redirect=True)
-        except wikipedia.exceptions.DisambiguationError as e:
-            # Look for business-related options first
-            business_keywords = ['inc', 'corp', 'company', 'corporation', 'ltd', 'technology', 'software', 'systems']
-            for option in e.options:
-                option_lower = option.lower()
-                if any(keyword in option_lower for keyword in business_keywords):
+            results = wikipedia.search(query, results=5)
+        except Exception:
+            continue
+        
+        for candidate in results:
+            try:
+                return wikipedia.summary(candidate, sentences=sentences,
+                                       auto_suggest=False, redirect=True)
+            except wikipedia.exceptions.DisambiguationError as e:
+                # Look for business-related options first, otherwise try the first one
+                options = [option for option in e.options
+                           if any(keyword in option.lower() for keyword in business_keywords)]
+                for option in options or e.options[:1]:
                     try:
                         return wikipedia.summary(option, sentences=sentences,
                                                auto_suggest=False)
                     except Exception:
                         continue
-            # If no business-related option found, try the first one
-            if e.options:
-                try:
-                    return wikipedia.summary(e.options[0], sentences=sentences,
-                                           auto_suggest=False)
-                except Exception:
-                    continue
-        except wikipedia.exceptions.PageError:
-            continue
-        except Exception:
-            continue
+            except Exception:
+                # Missing pages and network errors - try the next match
+                continue
 
     return "Wikipedia summary not found."
 
+def downsample_indices(y, n_out=1000):
+    """Pick ~n_out visually representative positions of a series for plotting"""
+    if len(y) <= n_out:
+        return np.arange(len(y))
+    return MinMaxLTTBDownsampler().downsample(np.ascontiguousarray(y), n_out=n_out)
+
+@st.cache_resource(max_entries=50)
 def create_simple_price_chart(data):
     """Create a simple price trend chart"""
     hist = data["history"]
     ticker = data["Ticker"]
     
+    # Calculate 50-day moving average on the full history, then downsample both lines
+    close = hist['Close'].to_numpy()
+    ma50 = fast_sma(close, 50)
+    idx = downsample_indices(close)
+    # float32 is plenty for plotting and halves the payload sent to the browser
+    dates = hist.index[idx]
+    close, ma50 = close[idx].astype(np.float32), ma50[idx].astype(np.float32)
+    
     fig = go.Figure()
     
     # Simple line chart for price trend
     fig.add_trace(
-        go.Scatter(
-            x=hist.index,
-            y=hist['Close'],
+        go.Scattergl(
+            x=dates,
+            y=close,
             mode='lines',
             name=f'{ticker} Price',
             line=dict(color='#1f77b4', width=3),
@@ -202,11 +515,11 @@ def create_simple_price_chart(data):
     )
     
     # Add 50-day moving average if available
-    if not hist["MA50"].isna().all():
+    if not np.isnan(ma50).all():
         fig.add_trace(
-            go.Scatter(
-                x=hist.index,
-                y=hist['MA50'],
+            go.Scattergl(
+                x=dates,
+                y=ma50,
                 mode='lines',
                 name='50-day MA',
                 line=dict(color='orange', width=2, dash='dash'),
@@ -228,6 +541,7 @@ def create_simple_price_chart(data):
     
     return fig
 
+@st.cache_resource(max_entries=20)
 def create_comparison_chart(all_data):
     """Create a simple comparison chart for multiple stocks"""
     if len(all_data) < 2:
@@ -235,17 +549,28 @@ def create_comparison_chart(all_data):
     
     fig = go.Figure()
     
-    for data in all_data:
-        hist = data["history"]
+    histories = [data["history"] for data in all_data]
+    
+    # Normalize prices to percentage change from first day - in one vector op
+    # when all histories share the same dates, otherwise per stock
+    if all(hist.index.equals(histories[0].index) for hist in histories[1:]):
+        closes = np.column_stack([hist['Close'].to_numpy() for hist in histories])
+        normalized = (closes / closes[0] - 1.0) * 100
+        series = [(histories[0].index, normalized[:, i]) for i in range(len(histories))]
+    else:
+        series = []
+        for hist in histories:
+            close = hist['Close'].to_numpy()
+            series.append((hist.index, (close / close[0] - 1.0) * 100))
+    
+    for data, (dates, normalized_prices) in zip(all_data, series):
         ticker = data["Ticker"]
-        
-        # Normalize prices to percentage change from first day
-        normalized_prices = (hist['Close'] / hist['Close'].iloc[0] - 1) * 100
+        idx = downsample_indices(normalized_prices)
         
         fig.add_trace(
-            go.Scatter(
-                x=hist.index,
-                y=normalized_prices,
+            go.Scattergl(
+                x=dates[idx],
+                y=normalized_prices[idx].astype(np.float32),
                 mode='lines',
                 name=ticker,
                 line=dict(width=3),
@@ -267,6 +592,20 @@ def create_comparison_chart(all_data):
     
     return fig
 
+@st.cache_data(ttl=600)  # Cache for 10 minutes
+def _to_csv_bytes(df, index=False):
+    """Serialize a DataFrame to CSV bytes for download"""
+    return df.to_csv(index=index).encode()
+
+def _script_thread_pool(max_workers):
+    """Thread pool whose workers share the script run context, so cached calls work in them"""
+    # Workers must still leave all UI calls to the script thread
+    ctx = get_script_run_ctx()
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    )
+
 def build_dashboard(tickers, period="6mo"):
     """Build dashboard for multiple tickers (up to 10)"""
     # Handle single ticker input
@@ -279,21 +618,38 @@ def build_dashboard(tickers, period="6mo"):
         tickers = tickers[:10]
     
     # Collect data for all tickers
-    all_data = []
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for i, ticker in enumerate(tickers):
-        status_text.text(f"Fetching data for {ticker.strip().upper()}...")
-        progress_bar.progress((i + 1) / len(tickers))
-        
-        try:
-            stock_data = get_stock_data(ticker.strip().upper(), period)
-            if stock_data:
-                all_data.append(stock_data)
-        except Exception as e:
-            st.error(f"Error fetching data for {ticker}: {e}")
-            continue
+    status_text.text(f"Fetching data for {len(tickers)} stocks...")
+    tickers = [ticker.strip().upper() for ticker in tickers]
+    
+    # Download all price histories in one request
+    try:
+        histories = get_history_batch(tuple(sorted(set(tickers))))
+    except Exception as e:
+        st.error(f"Error fetching price history: {e}")
+        histories = {}
+    
+    # Fetch company info for all tickers in parallel - the work is network-bound
+    results = {}
+    with _script_thread_pool(min(10, len(tickers))) as executor:
+        futures = {
+            executor.submit(get_stock_data, ticker, slice_history(histories.get(ticker), period)): i
+            for i, ticker in enumerate(tickers)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i = futures[future]
+            progress_bar.progress(done / len(tickers))
+            try:
+                stock_data = future.result()
+                if stock_data:
+                    results[i] = stock_data
+            except Exception as e:
+                st.error(f"Error fetching data for {tickers[i]}: {e}")
+    
+    # Keep the original ticker order
+    all_data = [results[i] for i in sorted(results)]
     
     progress_bar.empty()
     status_text.empty()
@@ -302,57 +658,17 @@ def build_dashboard(tickers, period="6mo"):
         st.error("No valid stock data found.")
         return pd.DataFrame()
     
-    # Create DataFrame with all metrics (matching original script)
-    fundamentals_data = []
-    for data in all_data:
-        fundamentals_data.append({
-            "Ticker": data["Ticker"],
-            "Price": data["Price"],
-            "P/E": data["P/E"],
-            "Forward P/E": data["Forward P/E"],
-            "Price/Book": data["Price/Book"],
-            "Market Cap": data["Market Cap"],
-            "Debt/Equity": data["Debt/Equity"],
-            "RSI": data["RSI"],
-            "50-day MA": data["50-day MA"],
-            "Beta": data["Beta"],
-            "Analyst Rating": data["Analyst Rating"],
-            "Target Price": data["Target Price"]
-        })
-    
-    fundamentals = pd.DataFrame(fundamentals_data)
+    # Create DataFrame with all metrics (matching original script), one column at a time.
+    # Arrow-backed columns let st.dataframe skip the pandas to Arrow conversion.
+    fundamentals = pd.DataFrame(
+        {key: [data[key] for data in all_data] for key in METRIC_KEYS}
+    ).convert_dtypes(dtype_backend="pyarrow", convert_integer=False)
     
     return fundamentals, all_data
 
 def main():
     # Enhanced Header with visual elements
-    st.markdown("""
-    <div class="header-container">
-        <div style="text-align: center;">
-            <div style="font-size: 5rem; margin-bottom: 1rem; background: linear-gradient(45deg, #ff6b6b, #4ecdc4, #45b7d1, #96ceb4, #feca57); background-size: 300% 300%; animation: gradient 3s ease infinite;">
-                📊📈💹🚀💰
-            </div>
-            <h1 class="main-header">Stock Analysis Dashboard</h1>
-            <div style="font-size: 1.3rem; color: #555; margin-top: 1.5rem; font-weight: 500;">
-                <span class="feature-icons">🎯</span>Simple stock analysis with price trends and comprehensive metrics<span class="feature-icons">📊</span>
-            </div>
-            <div style="margin-top: 1.5rem; font-size: 1rem; color: #777; display: flex; justify-content: center; flex-wrap: wrap; gap: 2rem;">
-                <span><strong>✨ Real-time Data</strong></span>
-                <span><strong>📚 Educational Explanations</strong></span>
-                <span><strong>💾 CSV Exports</strong></span>
-                <span><strong>📈 Up to 10 Stocks</strong></span>
-            </div>
-        </div>
-    </div>
-    
-    <style>
-    @keyframes gradient {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    st.markdown(_HEADER_HTML, unsafe_allow_html=True)
     
     # Sidebar
     with st.sidebar:
@@ -419,99 +735,23 @@ def main():
             tab1, tab2, tab3, tab4 = st.tabs(["💰 Valuation", "📈 Technical", "🏢 Health", "🎯 Analyst"])
             
             with tab1:
-                st.markdown("""
-                ### 💰 Valuation Metrics - "Is this stock expensive or cheap?"
-                
-                **💵 Price:**
-                - **What it is:** Current cost to buy one share
-                - **How to use:** Compare with historical prices
-                - **Example:** Apple at $150 = you pay $150 for one share
-                
-                **📊 P/E Ratio (Price-to-Earnings):**
-                - **What it is:** How much you pay for each dollar of profit
-                - **Formula:** Stock Price ÷ Annual Earnings per Share
-                - **Low P/E (5-15):** Cheap stock or troubled company
-                - **Medium P/E (15-25):** Fairly valued
-                - **High P/E (25+):** Expensive, high growth expected
-                - **Example:** P/E of 20 = pay $20 for every $1 of annual profit
-                
-                **🔮 Forward P/E:**
-                - **What it is:** P/E based on expected future earnings
-                - **Why important:** Shows future value expectations
-                - **Lower than current P/E:** Growing earnings expected
-                
-                **📖 Price/Book:**
-                - **What it is:** Price vs company's asset value
-                - **Below 1:** Trading below asset value (potential bargain)
-                - **1-3:** Normal range
-                - **Above 3:** Premium valuation
-                """)
+                st.markdown(_GUIDE_VALUATION_MD)
             
             with tab2:
-                st.markdown("""
-                ### 📈 Technical Indicators - "What's the momentum?"
-                
-                **🎯 RSI (0-100 scale):**
-                - **What it is:** Momentum meter for stocks
-                - **0-30:** Oversold (might bounce up)
-                - **30-70:** Normal range
-                - **70-100:** Overbought (might drop)
-                - **Example:** RSI 80 = rising very fast lately
-                
-                **📊 50-day Moving Average:**
-                - **What it is:** Average price over 50 days
-                - **Purpose:** Shows real trend, ignores daily noise
-                - **Price above MA:** Upward trend
-                - **Price below MA:** Downward trend
-                
-                **⚡ Beta:**
-                - **What it is:** Volatility vs market
-                - **Beta < 1:** Less volatile (safer)
-                - **Beta = 1:** Moves with market
-                - **Beta > 1:** More volatile (riskier)
-                - **Example:** Beta 1.5 = if market +10%, stock typically +15%
-                """)
+                st.markdown(_GUIDE_TECHNICAL_MD)
             
             with tab3:
-                st.markdown("""
-                ### 🏢 Company Health - "How strong is the company?"
-                
-                **🏦 Market Cap:**
-                - **What it is:** Total company value
-                - **Small Cap:** Under $2B (risky, high potential)
-                - **Mid Cap:** $2-10B (balanced)
-                - **Large Cap:** Over $10B (stable)
-                
-                **💳 Debt/Equity:**
-                - **What it is:** How much debt vs equity
-                - **Low (0-0.3):** Conservative, safe
-                - **Medium (0.3-0.6):** Balanced
-                - **High (0.6+):** Aggressive, risky
-                """)
+                st.markdown(_GUIDE_HEALTH_MD)
             
             with tab4:
-                st.markdown("""
-                ### 🎯 Analyst Data - "What do experts think?"
-                
-                **⭐ Analyst Rating:**
-                - **Strong Buy:** Very bullish
-                - **Buy:** Positive outlook
-                - **Hold:** Neutral
-                - **Sell:** Negative outlook
-                
-                **🎯 Target Price:**
-                - **What it is:** Expected price in 12 months
-                - **Target > Current:** Expected to rise
-                - **Target < Current:** Expected to fall
-                - **Note:** Predictions, not guarantees!
-                """)
+                st.markdown(_GUIDE_ANALYST_MD)
         
         # CSV Download
         st.header("💾 Download Data")
         col1, col2 = st.columns(2)
         
         with col1:
-            csv = fundamentals.to_csv(index=False)
+            csv = _to_csv_bytes(fundamentals)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             ticker_str = "_".join([ticker.strip().upper() for ticker in tickers])
             filename = f"stock_analysis_{ticker_str}_{timestamp}.csv"
@@ -527,13 +767,14 @@ def main():
         with col2:
             if len(all_data) > 0:
                 # Combine historical data for download
-                combined_hist = pd.DataFrame()
-                for data in all_data:
-                    hist_copy = data["history"].copy()
-                    hist_copy['Ticker'] = data["Ticker"]
-                    combined_hist = pd.concat([combined_hist, hist_copy])
+                frames = [
+                    data["history"].assign(MA50=fast_sma(data["history"]["Close"].to_numpy(), 50),
+                                           Ticker=data["Ticker"])
+                    for data in all_data
+                ]
+                combined_hist = pd.concat(frames)
                 
-                hist_csv = combined_hist.to_csv()
+                hist_csv = _to_csv_bytes(combined_hist, index=True)
                 hist_filename = f"historical_data_{ticker_str}_{timestamp}.csv"
                 
                 st.download_button(
@@ -636,10 +877,14 @@ def main():
             wiki_summary = get_wikipedia_summary(all_data[0]["Ticker"])
             st.write(f"**{all_data[0]['Ticker']}:** {wiki_summary}")
         else:
-            # Multiple stocks - use expanders
+            # Multiple stocks - fetch all summaries in parallel, then use expanders
+            ticker_list = [data["Ticker"] for data in all_data]
+            with _script_thread_pool(min(10, len(ticker_list))) as executor:
+                summaries = dict(zip(ticker_list, executor.map(get_wikipedia_summary, ticker_list)))
+            
             for data in all_data:
                 with st.expander(f"📋 {data['Ticker']} - Company Info"):
-                    wiki_summary = get_wikipedia_summary(data["Ticker"])
+                    wiki_summary = summaries[data["Ticker"]]
                     st.write(wiki_summary)
                     
                     # Show key metrics